@@ -1,20 +1,27 @@
 import asyncio
 import base64
-import json
+import hashlib
+import hmac
+import logging
 import os
 import secrets
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from urllib.parse import urlsplit
 
-import websockets
+import aiohttp
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, WebSocket
 from fastapi.responses import HTMLResponse
 from fastapi.websockets import WebSocketDisconnect
-from twilio.request_validator import RequestValidator
 from twilio.twiml.voice_response import Connect, VoiceResponse
 
 load_dotenv()
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
+
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
@@ -28,20 +35,31 @@ PORT = int(os.getenv("PORT", 5050))
 TEMPERATURE = float(os.getenv("TEMPERATURE", 0.8))
 ASSISTANT_INSTRUCTIONS = os.getenv("ASSISTANT_INSTRUCTIONS")
 VOICE = os.getenv("VOICE")
-LOG_EVENT_TYPES = [
-    "error",
-    "response.content.done",
-    "rate_limits.updated",
-    "response.done",
-    "input_audio_buffer.committed",
-    "input_audio_buffer.speech_stopped",
-    "input_audio_buffer.speech_started",
-    "session.created",
-    "session.updated",
-    "response.function_call_arguments.delta",
-    "response.function_call_arguments.done",
-]
+LOG_EVENT_TYPES = frozenset(
+    {
+        "error",
+        "response.content.done",
+        "rate_limits.updated",
+        "response.done",
+        "input_audio_buffer.committed",
+        "input_audio_buffer.speech_stopped",
+        "input_audio_buffer.speech_started",
+        "session.created",
+        "session.updated",
+        "response.function_call_arguments.delta",
+        "response.function_call_arguments.done",
+    }
+)
 SHOW_TIMING_MATH = False
+OPENAI_OUTBOUND_QUEUE_SIZE = 64
+# Keepalive ping interval; aiohttp never notices a half-open socket without one
+OPENAI_WS_HEARTBEAT_SECONDS = 20
+# Assistant audio held for Twilio while its socket is stalled; older audio is dropped
+TWILIO_OUTBOUND_BUFFER_MS = 1000
+# 8kHz PCMU is 8 bytes per ms, which base64 encodes as 32/3 characters
+_TWILIO_OUTBOUND_BUFFER_CHARS = TWILIO_OUTBOUND_BUFFER_MS * 32 // 3
+# Twilio sends 20ms caller audio frames; forward them to OpenAI in batches of this many
+INPUT_AUDIO_BATCH_FRAMES = 2
 
 app = FastAPI()
 
@@ -70,28 +88,153 @@ if not ASSISTANT_INSTRUCTIONS:
 if not VOICE:
     raise ValueError("Missing VOICE. Please set it in the .env file.")
 
-validator = RequestValidator(TWILIO_AUTH_TOKEN)
+# Session setup payloads only depend on startup config, so serialize them once
+_SESSION_UPDATE_BYTES = orjson.dumps(
+    {
+        "type": "session.update",
+        "session": {
+            "type": "realtime",
+            "model": "gpt-realtime",
+            "output_modalities": ["audio"],
+            "audio": {
+                "input": {
+                    "format": {"type": "audio/pcmu"},
+                    "turn_detection": {
+                        "type": "semantic_vad",
+                        "eagerness": "low",  # low = less likely to interrupt, waits for clear completion
+                    },
+                },
+                "output": {"format": {"type": "audio/pcmu"}, "voice": VOICE},
+            },
+            "instructions": ASSISTANT_INSTRUCTIONS,
+            "tools": [
+                {
+                    "type": "mcp",
+                    "server_label": "zapier",
+                    "server_url": ZAPIER_MCP_URL,
+                    "headers": {"Authorization": f"Bearer {ZAPIER_MCP_PASSWORD}"},
+                    "require_approval": "never",
+                }
+            ],
+        },
+    }
+)
+_INITIAL_CONV_ITEM_BYTES = orjson.dumps(
+    {
+        "type": "conversation.item.create",
+        "item": {
+            "type": "message",
+            "role": "user",
+            "content": [
+                {"type": "input_text", "text": "Greet the user with 'Hey, what's up?'"}
+            ],
+        },
+    }
+)
+_RESPONSE_CREATE_BYTES = orjson.dumps({"type": "response.create"})
+
+# Keyed once at startup; copying it per request skips re-deriving the HMAC key pads
+_twilio_hmac = hmac.new(TWILIO_AUTH_TOKEN.encode(), digestmod=hashlib.sha1)
+
+
+def compute_twilio_signature(url, params):
+    """Compute Twilio's base64 HMAC-SHA1 signature for a URL and its POST params."""
+    # Like RequestValidator, sign every value of a repeated field (e.g. FormData)
+    getlist = getattr(params, "getlist", None)
+    payload = url + "".join(
+        key + value
+        for key in sorted(set(params))
+        for value in sorted(set(getlist(key) if getlist else [params[key]]))
+    )
+    mac = _twilio_hmac.copy()
+    mac.update(payload.encode())
+    return base64.b64encode(mac.digest())
+
+
+def validate_twilio(url, params, signature):
+    """Validate an X-Twilio-Signature header, matching Twilio's RequestValidator."""
+    # Twilio may have signed the URL with or without the default port, so try both
+    parsed = urlsplit(url)
+    if parsed.port:
+        # Only strip the ":port" suffix, leaving host case and userinfo untouched
+        without_port = parsed._replace(netloc=parsed.netloc.rpartition(":")[0])
+        urls = [parsed.geturl(), without_port.geturl()]
+    else:
+        port = 443 if parsed.scheme == "https" else 80
+        with_port = parsed._replace(netloc=f"{parsed.netloc}:{port}")
+        urls = [with_port.geturl(), parsed.geturl()]
+
+    expected = signature.encode()
+    return any(
+        hmac.compare_digest(compute_twilio_signature(candidate, params), expected)
+        for candidate in urls
+    )
+
+
+# Twilio media frames are compact JSON that always start with the event key
+_MEDIA_EVENT_PREFIX = '{"event":"media"'
+_MEDIA_TIMESTAMP_KEY = '"timestamp":"'
+_MEDIA_PAYLOAD_KEY = '"payload":"'
+
+
+def _extract_string_value(raw, key):
+    """Return the JSON string value following key in raw, or None if not found."""
+    start = raw.find(key)
+    if start == -1:
+        return None
+    start += len(key)
+    end = raw.find('"', start)
+    if end == -1:
+        return None
+    value = raw[start:end]
+    # Escaped values need a real JSON parser
+    return None if "\\" in value else value
+
 
-# WebSocket token storage (token -> expiration timestamp)
+def parse_media_frame(raw):
+    """Extract (timestamp, payload) from a Twilio media frame without a full JSON parse.
+
+    Returns None for other events or unexpected layouts so callers fall back to orjson.
+    """
+    if not isinstance(raw, str) or not raw.startswith(_MEDIA_EVENT_PREFIX):
+        return None
+    timestamp = _extract_string_value(raw, _MEDIA_TIMESTAMP_KEY)
+    payload = _extract_string_value(raw, _MEDIA_PAYLOAD_KEY)
+    if timestamp is None or payload is None:
+        return None
+    return timestamp, payload
+
+
+# Outbound media messages only vary by payload, so they are spliced from a template
+_TWILIO_MEDIA_SUFFIX = '"}}'
+
+
+def build_twilio_media_prefix(stream_sid):
+    """Build the JSON that precedes the base64 payload in a Twilio media message."""
+    return (
+        '{"event":"media","streamSid":'
+        + orjson.dumps(stream_sid).decode()
+        + ',"media":{"payload":"'
+    )
+
+
+# WebSocket token storage (token -> monotonic expiration deadline in ns)
 websocket_tokens = {}
+WEBSOCKET_TOKEN_TTL_SECONDS = 60
 
 
 def generate_websocket_token():
     """Generate a secure token for WebSocket authentication."""
     token = secrets.token_urlsafe(32)
-    expiration = datetime.now() + timedelta(seconds=60)
+    expiration = time.monotonic_ns() + WEBSOCKET_TOKEN_TTL_SECONDS * 1_000_000_000
     websocket_tokens[token] = expiration
+    # Drop the token once it expires; a no-op if it was already used
+    asyncio.get_running_loop().call_later(
+        WEBSOCKET_TOKEN_TTL_SECONDS, websocket_tokens.pop, token, None
+    )
     return token
 
 
-def cleanup_expired_tokens():
-    """Remove expired tokens from storage."""
-    now = datetime.now()
-    expired = [token for token, exp in websocket_tokens.items() if exp < now]
-    for token in expired:
-        del websocket_tokens[token]
-
-
 @app.post("/incoming-call")
 async def handle_incoming_call(request: Request):
     """Handle incoming call and return TwiML response to connect to Media Stream."""
@@ -109,17 +252,14 @@ async def handle_incoming_call(request: Request):
     signature = request.headers.get("X-Twilio-Signature", "")
 
     # Get form data for validation
+    # FormData is already a mapping, so validate it without copying into a dict
     form_data = await request.form()
-    params = dict(form_data)
 
-    if not validator.validate(url, params, signature):
-        print(f"Signature validation failed. URL: {url}")
-        print(f"Signature: {signature}")
+    if not validate_twilio(url, form_data, signature):
+        logger.warning("Signature validation failed. URL: %s", url)
+        logger.warning("Signature: %s", signature)
         raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
-    # Clean up expired tokens periodically
-    cleanup_expired_tokens()
-
     # Generate WebSocket token
     ws_token = generate_websocket_token()
 
@@ -129,23 +269,19 @@ async def handle_incoming_call(request: Request):
     host = request.url.hostname
     connect = Connect()
     stream_url = f"wss://{host}/media-stream"
-    print(f"Generated WebSocket URL: {stream_url}")
-    print(f"Token: {ws_token}")
+    logger.info("Generated WebSocket URL: %s", stream_url)
+    logger.debug("Token: %s", ws_token)
     stream = connect.stream(url=stream_url)
     stream.parameter(name="token", value=ws_token)
     response.append(connect)
     twiml_response = str(response)
-    print(f"TwiML Response: {twiml_response}")
+    logger.debug("TwiML Response: %s", twiml_response)
     return HTMLResponse(content=twiml_response, media_type="application/xml")
 
 
 @app.websocket("/media-stream")
 async def handle_media_stream(websocket: WebSocket):
     """Handle WebSocket connections between Twilio and OpenAI."""
-    print(
-        f"WebSocket connection attempt - Query params: {dict(websocket.query_params)}"
-    )
-
     # Twilio sends custom parameters in the 'start' event, not query params
     # We'll need to accept first, then validate from the start event
     await websocket.accept()
@@ -157,8 +293,8 @@ async def handle_media_stream(websocket: WebSocket):
         initial_stream_sid = None
         while True:
             message = await websocket.receive_text()
-            data = json.loads(message)
-            print(f"Received event: {data.get('event')}")
+            data = orjson.loads(message)
+            logger.debug("Received event: %s", data.get("event"))
 
             if data.get("event") == "start":
                 # Get token from custom parameters
@@ -166,8 +302,10 @@ async def handle_media_stream(websocket: WebSocket):
                 token = custom_params.get("token")
                 # Save the streamSid for later use
                 initial_stream_sid = data.get("start", {}).get("streamSid")
-                print(
-                    f"Token from start event: {token}, StreamSid: {initial_stream_sid}"
+                logger.debug(
+                    "Token from start event: %s, StreamSid: %s",
+                    token,
+                    initial_stream_sid,
                 )
                 break
             elif data.get("event") == "connected":
@@ -175,69 +313,178 @@ async def handle_media_stream(websocket: WebSocket):
                 continue
             else:
                 # Unexpected event
-                print(f"WebSocket rejected: Unexpected event {data.get('event')}")
+                logger.warning(
+                    "WebSocket rejected: Unexpected event %s", data.get("event")
+                )
                 await websocket.close(code=1008, reason="Unexpected event")
                 return
 
         if not token or token not in websocket_tokens:
-            print(
-                f"WebSocket rejected: Invalid or missing token. Token: {token}, Valid tokens: {list(websocket_tokens.keys())}"
-            )
+            logger.warning("WebSocket rejected: Invalid or missing token")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Token: %s, Valid tokens: %s", token, list(websocket_tokens)
+                )
             await websocket.close(code=1008, reason="Invalid or missing token")
             return
 
         # Check token expiration
-        if datetime.now() > websocket_tokens[token]:
+        if time.monotonic_ns() > websocket_tokens[token]:
             del websocket_tokens[token]
-            print("WebSocket rejected: Token expired")
+            logger.warning("WebSocket rejected: Token expired")
             await websocket.close(code=1008, reason="Token expired")
             return
 
         # Remove token (single-use)
         del websocket_tokens[token]
-        print(f"Client connected with valid token: {token}")
+        logger.info("Client connected with valid token")
 
     except Exception as e:
-        print(f"Error during WebSocket auth: {e}")
+        logger.error("Error during WebSocket auth: %s", e)
         await websocket.close(code=1011, reason="Authentication error")
         return
 
-    async with websockets.connect(
-        f"wss://api.openai.com/v1/realtime?model=gpt-realtime&temperature={TEMPERATURE}",
-        additional_headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-    ) as openai_ws:
+    async with (
+        aiohttp.ClientSession() as session,
+        session.ws_connect(
+            f"wss://api.openai.com/v1/realtime?model=gpt-realtime&temperature={TEMPERATURE}",
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+            heartbeat=OPENAI_WS_HEARTBEAT_SECONDS,
+        ) as openai_ws,
+    ):
         await initialize_session(openai_ws)
 
         # Connection specific state
         stream_sid = initial_stream_sid
+        twilio_media_prefix = build_twilio_media_prefix(stream_sid)
         latest_media_timestamp = 0
         last_assistant_item = None
-        mark_queue = []
+        mark_queue = deque()
         response_start_timestamp_twilio = None
 
+        # Outbound frames are queued and drained by one writer task per socket.
+        # Twilio audio is dropped oldest-first if its socket stalls; control
+        # messages are never dropped and go out ahead of queued audio.
+        twilio_audio_q = deque()
+        twilio_audio_chars = 0
+        twilio_control_q = deque()
+        twilio_out_ready = asyncio.Event()
+        openai_out_q = asyncio.Queue(maxsize=OPENAI_OUTBOUND_QUEUE_SIZE)
+
+        async def queue_audio_to_twilio(payload):
+            """Queue a base64 audio delta for Twilio, dropping the oldest audio if over budget."""
+            nonlocal twilio_audio_chars
+            twilio_audio_q.append(payload)
+            twilio_audio_chars += len(payload)
+            while (
+                twilio_audio_chars > _TWILIO_OUTBOUND_BUFFER_CHARS
+                and len(twilio_audio_q) > 1
+            ):
+                twilio_audio_chars -= len(twilio_audio_q.popleft())
+            twilio_out_ready.set()
+            # Buffered OpenAI messages are read without yielding, so give the writer a
+            # turn; otherwise a burst would overflow the buffer on a healthy socket
+            await asyncio.sleep(0)
+
+        def queue_control_to_twilio(message):
+            """Queue a control message for Twilio ahead of any pending audio."""
+            twilio_control_q.append(message)
+            twilio_out_ready.set()
+
+        def clear_twilio_audio():
+            """Discard audio that has not been written to Twilio yet."""
+            nonlocal twilio_audio_chars
+            twilio_audio_q.clear()
+            twilio_audio_chars = 0
+
+        async def twilio_writer():
+            """Drain queued messages to Twilio, following each audio delta with a mark."""
+            nonlocal twilio_audio_chars
+            try:
+                while True:
+                    await twilio_out_ready.wait()
+                    twilio_out_ready.clear()
+                    while twilio_control_q or twilio_audio_q:
+                        if twilio_control_q:
+                            await websocket.send_text(twilio_control_q.popleft())
+                            continue
+                        payload = twilio_audio_q.popleft()
+                        twilio_audio_chars -= len(payload)
+                        await websocket.send_text(
+                            twilio_media_prefix + payload + _TWILIO_MEDIA_SUFFIX
+                        )
+                        await send_mark(stream_sid)
+            except Exception as e:
+                logger.error("Error in twilio_writer: %s", e)
+
+        async def openai_writer():
+            """Drain queued frames to OpenAI."""
+            try:
+                while True:
+                    payload = await openai_out_q.get()
+                    if openai_ws.closed:
+                        return
+                    await openai_ws.send_frame(payload, aiohttp.WSMsgType.TEXT)
+            except Exception as e:
+                logger.error("Error in openai_writer: %s", e)
+
+        # Caller audio waiting to be sent as one input_audio_buffer.append
+        input_audio_chunks = []
+
+        async def flush_input_audio():
+            """Send buffered caller audio to OpenAI as a single append."""
+            if not input_audio_chunks or openai_ws.closed:
+                return
+            # Each 160-byte frame encodes with base64 padding, so re-encode the batch once
+            audio = b"".join(map(base64.b64decode, input_audio_chunks))
+            input_audio_chunks.clear()
+            audio_append = {
+                "type": "input_audio_buffer.append",
+                "audio": base64.b64encode(audio).decode(),
+            }
+            await openai_out_q.put(orjson.dumps(audio_append))
+
         async def receive_from_twilio():
             """Receive audio data from Twilio and send it to the OpenAI Realtime API."""
-            nonlocal stream_sid, latest_media_timestamp
+            nonlocal stream_sid, twilio_media_prefix, latest_media_timestamp
             try:
-                async for message in websocket.iter_text():
-                    data = json.loads(message)
-                    if data["event"] == "media" and openai_ws.state.name == "OPEN":
-                        latest_media_timestamp = int(data["media"]["timestamp"])
-                        audio_append = {
-                            "type": "input_audio_buffer.append",
-                            "audio": data["media"]["payload"],
-                        }
-                        await openai_ws.send(json.dumps(audio_append))
+                while True:
+                    # Read raw ASGI frames so orjson parses the payload as delivered,
+                    # whether Twilio sent it as a text or a binary frame
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    raw = message.get("text")
+                    if raw is None:
+                        raw = message["bytes"]
+
+                    # Media frames dominate the stream, so try to skip the full parse
+                    media = parse_media_frame(raw)
+                    if media is None:
+                        data = orjson.loads(raw)
+                        if data["event"] == "media":
+                            media = data["media"]["timestamp"], data["media"]["payload"]
+
+                    if media is not None:
+                        if not openai_ws.closed:
+                            timestamp, payload = media
+                            latest_media_timestamp = int(timestamp)
+                            input_audio_chunks.append(payload)
+                            if len(input_audio_chunks) >= INPUT_AUDIO_BATCH_FRAMES:
+                                await flush_input_audio()
                     elif data["event"] == "start":
                         stream_sid = data["start"]["streamSid"]
-                        print(f"Incoming stream has started {stream_sid}")
+                        twilio_media_prefix = build_twilio_media_prefix(stream_sid)
+                        logger.info("Incoming stream has started %s", stream_sid)
                         latest_media_timestamp = 0
                     elif data["event"] == "mark":
                         if mark_queue:
-                            mark_queue.pop(0)
+                            mark_queue.popleft()
+                    elif data["event"] == "stop":
+                        await flush_input_audio()
             except WebSocketDisconnect:
-                print("Client disconnected.")
-                if openai_ws.state.name == "OPEN":
+                logger.info("Client disconnected.")
+                if not openai_ws.closed:
                     await openai_ws.close()
 
         async def send_to_twilio():
@@ -245,23 +492,25 @@ async def handle_media_stream(websocket: WebSocket):
             nonlocal stream_sid, last_assistant_item, response_start_timestamp_twilio
             try:
                 async for openai_message in openai_ws:
-                    response = json.loads(openai_message)
-                    if response["type"] in LOG_EVENT_TYPES:
-                        print(f"Received event: {response['type']}", response)
+                    if openai_message.type is aiohttp.WSMsgType.ERROR:
+                        raise openai_ws.exception() or RuntimeError(
+                            "OpenAI WebSocket error"
+                        )
+                    response = orjson.loads(openai_message.data)
+                    if response["type"] == "error":
+                        logger.error("Received event: error %s", response)
+                    elif response["type"] in LOG_EVENT_TYPES:
+                        logger.debug(
+                            "Received event: %s %s", response["type"], response
+                        )
 
                     if (
                         response.get("type") == "response.output_audio.delta"
                         and "delta" in response
                     ):
-                        audio_payload = base64.b64encode(
-                            base64.b64decode(response["delta"])
-                        ).decode("utf-8")
-                        audio_delta = {
-                            "event": "media",
-                            "streamSid": stream_sid,
-                            "media": {"payload": audio_payload},
-                        }
-                        await websocket.send_json(audio_delta)
+                        # OpenAI already sends base64 PCMU, which is what Twilio expects,
+                        # and base64 needs no JSON escaping
+                        await queue_audio_to_twilio(response["delta"])
 
                         if (
                             response.get("item_id")
@@ -270,38 +519,47 @@ async def handle_media_stream(websocket: WebSocket):
                             response_start_timestamp_twilio = latest_media_timestamp
                             last_assistant_item = response["item_id"]
                             if SHOW_TIMING_MATH:
-                                print(
-                                    f"Setting start timestamp for new response: {response_start_timestamp_twilio}ms"
+                                logger.debug(
+                                    "Setting start timestamp for new response: %sms",
+                                    response_start_timestamp_twilio,
                                 )
 
-                        await send_mark(websocket, stream_sid)
+                    if response.get("type") == "input_audio_buffer.speech_stopped":
+                        await flush_input_audio()
 
                     # Trigger an interruption. Your use case might work better using `input_audio_buffer.speech_stopped`, or combining the two.
                     if response.get("type") == "input_audio_buffer.speech_started":
-                        print("Speech started detected.")
+                        logger.info("Speech started detected.")
                         if last_assistant_item:
-                            print(
-                                f"Interrupting response with id: {last_assistant_item}"
+                            logger.info(
+                                "Interrupting response with id: %s", last_assistant_item
                             )
                             await handle_speech_started_event()
             except Exception as e:
-                print(f"Error in send_to_twilio: {e}")
+                logger.error("Error in send_to_twilio: %s", e)
 
         async def handle_speech_started_event():
             """Handle interruption when the caller's speech starts."""
             nonlocal response_start_timestamp_twilio, last_assistant_item
-            print("Handling speech started event.")
+            logger.debug("Handling speech started event.")
+            # Unsent audio is stale now, whether or not any of it has played yet
+            clear_twilio_audio()
             if mark_queue and response_start_timestamp_twilio is not None:
                 elapsed_time = latest_media_timestamp - response_start_timestamp_twilio
                 if SHOW_TIMING_MATH:
-                    print(
-                        f"Calculating elapsed time for truncation: {latest_media_timestamp} - {response_start_timestamp_twilio} = {elapsed_time}ms"
+                    logger.debug(
+                        "Calculating elapsed time for truncation: %s - %s = %sms",
+                        latest_media_timestamp,
+                        response_start_timestamp_twilio,
+                        elapsed_time,
                     )
 
                 if last_assistant_item:
                     if SHOW_TIMING_MATH:
-                        print(
-                            f"Truncating item with ID: {last_assistant_item}, Truncated at: {elapsed_time}ms"
+                        logger.debug(
+                            "Truncating item with ID: %s, Truncated at: %sms",
+                            last_assistant_item,
+                            elapsed_time,
                         )
 
                     truncate_event = {
@@ -310,86 +568,86 @@ async def handle_media_stream(websocket: WebSocket):
                         "content_index": 0,
                         "audio_end_ms": elapsed_time,
                     }
-                    await openai_ws.send(json.dumps(truncate_event))
+                    if not openai_ws.closed:
+                        await openai_out_q.put(orjson.dumps(truncate_event))
 
-                await websocket.send_json({"event": "clear", "streamSid": stream_sid})
+                queue_control_to_twilio(
+                    orjson.dumps({"event": "clear", "streamSid": stream_sid}).decode()
+                )
 
                 mark_queue.clear()
                 last_assistant_item = None
                 response_start_timestamp_twilio = None
 
-        async def send_mark(connection, stream_sid):
+        async def send_mark(stream_sid):
             if stream_sid:
                 mark_event = {
                     "event": "mark",
                     "streamSid": stream_sid,
                     "mark": {"name": "responsePart"},
                 }
-                await connection.send_json(mark_event)
+                await websocket.send_text(orjson.dumps(mark_event).decode())
+                # Only count marks Twilio has actually been sent, so each one gets acked
                 mark_queue.append("responsePart")
 
-        await asyncio.gather(receive_from_twilio(), send_to_twilio())
+        relays = [
+            asyncio.create_task(receive_from_twilio()),
+            asyncio.create_task(send_to_twilio()),
+        ]
+        writers = [
+            asyncio.create_task(twilio_writer()),
+            asyncio.create_task(openai_writer()),
+        ]
+        try:
+            # Writers only return once a send has failed. Stop relaying then, since
+            # nothing is left to drain their queues and the relays would block on them.
+            # A relay that raised also ends the call, as it would have with gather()
+            pending = {*relays, *writers}
+            while not all(relay.done() for relay in relays):
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                if any(task in writers or task.exception() for task in done):
+                    break
+            for relay in relays:
+                if relay.done():
+                    relay.result()
+        finally:
+            for task in (*relays, *writers):
+                task.cancel()
+            if not openai_ws.closed:
+                await openai_ws.close()
 
 
 async def send_initial_conversation_item(openai_ws):
     """Send initial conversation item if AI talks first."""
-    initial_conversation_item = {
-        "type": "conversation.item.create",
-        "item": {
-            "type": "message",
-            "role": "user",
-            "content": [
-                {"type": "input_text", "text": "Greet the user with 'Hey, what's up?'"}
-            ],
-        },
-    }
-    await openai_ws.send(json.dumps(initial_conversation_item))
-    await openai_ws.send(json.dumps({"type": "response.create"}))
+    await openai_ws.send_frame(_INITIAL_CONV_ITEM_BYTES, aiohttp.WSMsgType.TEXT)
+    await openai_ws.send_frame(_RESPONSE_CREATE_BYTES, aiohttp.WSMsgType.TEXT)
 
 
 async def initialize_session(openai_ws):
     """Control initial session with OpenAI."""
-    session_config = {
-        "type": "realtime",
-        "model": "gpt-realtime",
-        "output_modalities": ["audio"],
-        "audio": {
-            "input": {
-                "format": {"type": "audio/pcmu"},
-                "turn_detection": {
-                    "type": "semantic_vad",
-                    "eagerness": "low",  # low = less likely to interrupt, waits for clear completion
-                },
-            },
-            "output": {"format": {"type": "audio/pcmu"}, "voice": VOICE},
-        },
-        "instructions": ASSISTANT_INSTRUCTIONS,
-        "tools": [
-            {
-                "type": "mcp",
-                "server_label": "zapier",
-                "server_url": ZAPIER_MCP_URL,
-                "headers": {"Authorization": f"Bearer {ZAPIER_MCP_PASSWORD}"},
-                "require_approval": "never",
-            }
-        ],
-    }
-
-    session_update = {"type": "session.update", "session": session_config}
-    print("Sending session update:", json.dumps(session_update))
-    await openai_ws.send(json.dumps(session_update))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sending session update: %s", _SESSION_UPDATE_BYTES.decode())
+    await openai_ws.send_frame(_SESSION_UPDATE_BYTES, aiohttp.WSMsgType.TEXT)
 
     # Wait for and log the session.updated response to see what tools are registered
-    response = await openai_ws.recv()
-    response_data = json.loads(response)
-    print(f"Session update response: {json.dumps(response_data, indent=2)}")
+    response_data = await openai_ws.receive_json(loads=orjson.loads)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Session update response: %s",
+            orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode(),
+        )
 
     if response_data.get("type") == "session.updated":
         tools = response_data.get("session", {}).get("tools", [])
-        print(f"Registered tools count: {len(tools)}")
+        logger.info("Registered tools count: %s", len(tools))
         for tool in tools:
-            print(
-                f"Tool: {tool.get('type')} - {tool.get('server_label')} - allowed_tools: {tool.get('allowed_tools')}"
+            logger.info(
+                "Tool: %s - %s - allowed_tools: %s",
+                tool.get("type"),
+                tool.get("server_label"),
+                tool.get("allowed_tools"),
             )
 
     # Have the AI speak first
@@ -399,5 +657,12 @@ async def initialize_session(openai_ws):
 if __name__ == "__main__":
     import uvicorn
 
-    # trunk-ignore(bandit/B104): Binding to 0.0.0.0 required for containerized deployment
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    uvicorn.run(
+        app,
+        # trunk-ignore(bandit/B104): Binding to 0.0.0.0 required for containerized deployment
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
@@ -0,0 +1,14 @@
+import os
+
+# main.py validates its configuration at import time. Assign the values outright
+# so a token exported in the shell can't leak into the signature tests
+os.environ.update(
+    {
+        "OPENAI_API_KEY": "test-openai-key",
+        "TWILIO_AUTH_TOKEN": "12345",
+        "ZAPIER_MCP_URL": "https://mcp.example.com/api/mcp/mcp",
+        "ZAPIER_MCP_PASSWORD": "test-zapier-password",
+        "ASSISTANT_INSTRUCTIONS": "Test instructions.",
+        "VOICE": "alloy",
+    }
+)
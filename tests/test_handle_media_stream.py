@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import orjson
+
+import main
+
+
+class FakeOpenAIWebSocket:
+    """Stands in for aiohttp's ClientWebSocketResponse; stays open until closed."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self._closed_event = asyncio.Event()
+
+    async def send_frame(self, data, opcode):
+        self.sent.append(orjson.loads(data))
+
+    async def receive_json(self, loads):
+        return {"type": "session.updated", "session": {"tools": []}}
+
+    async def close(self):
+        self.closed = True
+        self._closed_event.set()
+
+    def exception(self):
+        return None
+
+    async def __aiter__(self):
+        await self._closed_event.wait()
+        return
+        yield
+
+
+class FakeClientSession:
+    def __init__(self, openai_ws):
+        self.openai_ws = openai_ws
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def ws_connect(self, url, **kwargs):
+        return FakeWSConnect(self.openai_ws)
+
+
+class FakeWSConnect:
+    def __init__(self, openai_ws):
+        self.openai_ws = openai_ws
+
+    async def __aenter__(self):
+        return self.openai_ws
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeTwilioWebSocket:
+    """Replays ASGI receive messages; blocks once they run out, like an idle caller."""
+
+    def __init__(self, messages):
+        self.inbound = asyncio.Queue()
+        for message in messages:
+            self.inbound.put_nowait(message)
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+    async def receive(self):
+        return await self.inbound.get()
+
+    async def receive_text(self):
+        return (await self.inbound.get())["text"]
+
+    async def send_text(self, data):
+        self.sent.append(orjson.loads(data))
+
+
+def text_frame(data):
+    return {"type": "websocket.receive", "text": orjson.dumps(data).decode()}
+
+
+class HandleMediaStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.openai_ws = FakeOpenAIWebSocket()
+        patcher = mock.patch.object(
+            main.aiohttp, "ClientSession", lambda: FakeClientSession(self.openai_ws)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        main.websocket_tokens["test-token"] = float("inf")
+        self.addCleanup(main.websocket_tokens.pop, "test-token", None)
+
+    def twilio(self, *messages):
+        start = {
+            "event": "start",
+            "start": {
+                "streamSid": "MZ123",
+                "customParameters": {"token": "test-token"},
+            },
+        }
+        return FakeTwilioWebSocket(
+            [text_frame({"event": "connected"}), text_frame(start), *messages]
+        )
+
+    async def test_returns_when_twilio_disconnects(self):
+        websocket = self.twilio({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(main.handle_media_stream(websocket), timeout=2)
+        self.assertTrue(self.openai_ws.closed)
+
+    async def test_reraises_relay_errors(self):
+        # A media frame without a timestamp fails in receive_from_twilio while
+        # send_to_twilio is still waiting on the open OpenAI socket
+        websocket = self.twilio(text_frame({"event": "media", "media": {}}))
+        with self.assertRaises(KeyError):
+            await asyncio.wait_for(main.handle_media_stream(websocket), timeout=2)
+        self.assertTrue(self.openai_ws.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import base64
+import unittest
+
+import orjson
+
+import main
+
+# 20ms of 8kHz PCMU; 0xff bytes base64 encode to slashes, which JSON may escape
+PAYLOAD = base64.b64encode(b"\x7e\xff" * 80).decode()
+
+# Layout of a real Twilio media frame: compact, event key first
+MEDIA_FRAME = (
+    '{"event":"media","sequenceNumber":"4","media":{"track":"inbound",'
+    '"chunk":"2","timestamp":"5","payload":"' + PAYLOAD + '"},'
+    '"streamSid":"MZ18ad3ab5a668481ce02b83e7395059f0"}'
+)
+
+
+class ParseMediaFrameTest(unittest.TestCase):
+    def test_extracts_timestamp_and_payload(self):
+        self.assertEqual(main.parse_media_frame(MEDIA_FRAME), ("5", PAYLOAD))
+
+    def test_matches_full_parse(self):
+        media = orjson.loads(MEDIA_FRAME)["media"]
+        self.assertEqual(
+            main.parse_media_frame(MEDIA_FRAME),
+            (media["timestamp"], media["payload"]),
+        )
+
+    def test_falls_back_on_escaped_payload(self):
+        self.assertIn("/", PAYLOAD)
+        escaped = MEDIA_FRAME.replace(PAYLOAD, PAYLOAD.replace("/", "\\/"))
+        self.assertEqual(orjson.loads(escaped)["media"]["payload"], PAYLOAD)
+        self.assertIsNone(main.parse_media_frame(escaped))
+
+    def test_falls_back_on_other_frames(self):
+        frames = {
+            "longer event name": MEDIA_FRAME.replace('"media"', '"mediaX"', 1),
+            "mark": '{"event":"mark","sequenceNumber":"5","streamSid":"MZ1",'
+            '"mark":{"name":"responsePart"}}',
+            "start": '{"event":"start","sequenceNumber":"1","start":{"streamSid":'
+            '"MZ1","customParameters":{"token":"abc"}},"streamSid":"MZ1"}',
+            "spaced JSON": MEDIA_FRAME.replace('"event":', '"event": ', 1),
+            "bytes": MEDIA_FRAME.encode(),
+            "missing timestamp": MEDIA_FRAME.replace('"timestamp":"5",', ""),
+            "missing payload": '{"event":"media","media":{"timestamp":"5"}}',
+            "unterminated payload": MEDIA_FRAME[: MEDIA_FRAME.index(PAYLOAD) + 8],
+        }
+        for name, raw in frames.items():
+            with self.subTest(frame=name):
+                self.assertIsNone(main.parse_media_frame(raw))
+
+
+class TwilioMediaTemplateTest(unittest.TestCase):
+    def test_matches_serialized_message(self):
+        for stream_sid in ["MZ18ad3ab5a668481ce02b83e7395059f0", None]:
+            with self.subTest(stream_sid=stream_sid):
+                message = (
+                    main.build_twilio_media_prefix(stream_sid)
+                    + PAYLOAD
+                    + main._TWILIO_MEDIA_SUFFIX
+                )
+                expected = {
+                    "event": "media",
+                    "streamSid": stream_sid,
+                    "media": {"payload": PAYLOAD},
+                }
+                self.assertEqual(orjson.loads(message), expected)
+                self.assertEqual(message, orjson.dumps(expected).decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from starlette.datastructures import FormData
+from twilio.request_validator import RequestValidator
+
+import main
+
+# Set by tests/__init__.py; the documented example below is signed with it
+AUTH_TOKEN = "12345"
+
+PARAMS = {
+    "CallSid": "CA1234567890ABCDE",
+    "Caller": "+15551234567",
+    "Digits": "1234",
+    "From": "+15551234567",
+    "To": "+15557654321",
+}
+
+URLS = [
+    "https://your-domain.com/incoming-call",
+    "https://your-domain.com:443/incoming-call",
+    "https://your-domain.com/incoming-call?foo=1&bar=2",
+    "https://Your-Domain.com/incoming-call",
+    "https://Your-Domain.com:443/incoming-call",
+    "http://your-domain.com/incoming-call",
+    "http://your-domain.com:80/incoming-call",
+    "http://your-domain.com:5050/incoming-call",
+    "http://user:pw@your-domain.com/incoming-call",
+    "https://user@your-domain.com/incoming-call",
+    "https://[2001:db8::1]/incoming-call",
+]
+
+# RequestValidator strips the port with netloc.split(":")[0], which truncates
+# netlocs that contain another colon; validate_twilio strips only the suffix
+COLON_NETLOC_URLS = [
+    ("https://[2001:db8::1]/incoming-call", "https://[2001:db8::1]:443/incoming-call"),
+    (
+        "http://user:pw@your-domain.com/incoming-call",
+        "http://user:pw@your-domain.com:80/incoming-call",
+    ),
+]
+
+
+class ValidateTwilioTest(unittest.TestCase):
+    def setUp(self):
+        self.validator = RequestValidator(AUTH_TOKEN)
+
+    def test_matches_twilio_request_validator(self):
+        for signed_url in URLS:
+            signature = self.validator.compute_signature(signed_url, PARAMS)
+            for request_url in URLS:
+                with self.subTest(signed_url=signed_url, request_url=request_url):
+                    self.assertEqual(
+                        main.validate_twilio(request_url, PARAMS, signature),
+                        self.validator.validate(request_url, PARAMS, signature),
+                    )
+
+    def test_strips_only_port_suffix(self):
+        for signed_url, request_url in COLON_NETLOC_URLS:
+            signature = self.validator.compute_signature(signed_url, PARAMS)
+            with self.subTest(request_url=request_url):
+                self.assertTrue(main.validate_twilio(request_url, PARAMS, signature))
+
+    def test_matches_twilio_on_repeated_form_fields(self):
+        form = FormData([*PARAMS.items(), ("Digits", "5678")])
+        signature = self.validator.compute_signature(URLS[0], form)
+        self.assertTrue(self.validator.validate(URLS[0], form, signature))
+        self.assertTrue(main.validate_twilio(URLS[0], form, signature))
+
+    def test_accepts_documented_example(self):
+        url = "https://mycompany.com/myapp.php?foo=1&bar=2"
+        params = {
+            "CallSid": "CA1234567890ABCDE",
+            "Caller": "+12349013030",
+            "Digits": "1234",
+            "From": "+12349013030",
+            "To": "+18005551212",
+        }
+        self.assertTrue(
+            main.validate_twilio(url, params, "0/KCTR6DLpKmkAf8muzZqo1nDgQ=")
+        )
+
+    def test_rejects_tampered_params(self):
+        url = URLS[0]
+        signature = self.validator.compute_signature(url, PARAMS)
+        tampered = {**PARAMS, "From": "+15550000000"}
+        self.assertFalse(main.validate_twilio(url, tampered, signature))
+
+    def test_rejects_bad_signature(self):
+        for signature in ["", "not-a-signature", "0/KCTR6DLpKmkAf8muzZqo1nDgQ=", "é"]:
+            with self.subTest(signature=signature):
+                self.assertFalse(main.validate_twilio(URLS[0], PARAMS, signature))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,28 @@
 import asyncio
 import os
+import queue
+import threading
 
 import streamlit as st
 from agents import Agent, HostedMCPTool, Runner
 from dotenv import load_dotenv
+from openai.types.responses import ResponseTextDeltaEvent
 
-load_dotenv()
+
+@st.cache_resource
+def load_env():
+    # Streamlit re-executes this script on every rerun; parse .env once per process
+    return load_dotenv()
+
+
+load_env()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ASSISTANT_INSTRUCTIONS = os.getenv("ASSISTANT_INSTRUCTIONS")
 ZAPIER_MCP_URL = os.getenv("ZAPIER_MCP_URL")
 ZAPIER_MCP_PASSWORD = os.getenv("ZAPIER_MCP_PASSWORD")
+# How often the Streamlit thread checks that the background agent loop is alive
+STREAM_POLL_SECONDS = 1.0
 
 if not OPENAI_API_KEY:
     st.error("Missing OPENAI_API_KEY. Please set it in the .env file.")
@@ -54,7 +66,59 @@ def get_agent():
     )
 
 
+@st.cache_resource
+def get_event_loop():
+    # One long-lived loop keeps the agent's HTTP connections warm across prompts
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
 agent = get_agent()
+loop = get_event_loop()
+
+
+def stream_agent(prompt):
+    # The run happens on the background loop; text deltas are handed back to the
+    # Streamlit thread through a queue, ending with None
+    chunks = queue.Queue()
+
+    async def produce():
+        try:
+            result = Runner.run_streamed(starting_agent=agent, input=prompt)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and isinstance(
+                    event.data, ResponseTextDeltaEvent
+                ):
+                    chunks.put(event.data.delta)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(None)
+
+    future = asyncio.run_coroutine_threadsafe(produce(), loop)
+    try:
+        while True:
+            try:
+                chunk = chunks.get(timeout=STREAM_POLL_SECONDS)
+            except queue.Empty:
+                # produce() always ends with None, so a finished future or a stopped
+                # loop with nothing queued means the run died before reporting back
+                if (future.done() or not loop.is_running()) and chunks.empty():
+                    get_event_loop.clear()
+                    raise RuntimeError(
+                        "Agent event loop stopped before the run finished"
+                    ) from None
+                continue
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # Stop the agent turn if Streamlit abandons the stream (rerun or stop)
+        future.cancel()
+
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -73,15 +137,10 @@ if prompt := st.chat_input("Ask me anything..."):
         message_placeholder = st.empty()
 
         try:
-
-            async def run_agent():
-                return await Runner.run(starting_agent=agent, input=prompt)
-
-            result = asyncio.run(run_agent())
-
             full_response = ""
-            if result.final_output:
-                full_response = result.final_output
+            for delta in stream_agent(prompt):
+                full_response += delta
+                message_placeholder.markdown(full_response + "▌")
 
             message_placeholder.markdown(full_response)
 